@@ -1,14 +1,132 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from fnmatch import fnmatch
+import fnmatch
+import functools
 import logging
 import os
-from pathlib import Path
+import re
+import threading
 from typing import List, Tuple
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
+# Glob metacharacters; expressions without any are literal names and can be
+# matched with a hash lookup instead of a regex.
+_MAGIC = re.compile(r"[*?\[]")
+
+# Validation is I/O-bound, so a work-queue batch with more than this many
+# directories is scanned on the thread pool.
+_PARALLEL_THRESHOLD = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the shared thread pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+    return _executor
+
+
+def _translate_globstar(expression: str) -> "re.Pattern":
+    """Translate a glob containing ** (any number of directories) into a
+    regex matched against a /-separated relative path."""
+    segments = expression.split("/")
+    parts = []
+    for position, segment in enumerate(segments):
+        last = position == len(segments) - 1
+        if segment == "**":
+            # A trailing ** swallows any remaining path (file paths have no
+            # trailing slash); elsewhere it spans whole directory segments
+            parts.append(".*" if last else "(?:[^/]+/)*")
+            continue
+        translated = ""
+        for char in segment:
+            if char == "*":
+                translated += "[^/]*"
+            elif char == "?":
+                translated += "[^/]"
+            else:
+                translated += re.escape(char)
+        parts.append(translated if last else translated + "/")
+    return re.compile("".join(parts) + r"\Z")
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile(expression: str) -> "re.Pattern":
+    """Compile a glob expression into a regex once, caching the result."""
+    if "**" in expression:
+        return _translate_globstar(expression)
+    return re.compile(fnmatch.translate(expression))
+
+
+def _split_literals(patterns: List["FilePattern"]) -> Tuple[dict, tuple]:
+    """Split a node's patterns into a literal-name -> index map and a tuple
+    of (index, regex) pairs for the patterns that need a real match."""
+    literals = {
+        pattern.expression: index
+        for index, pattern in enumerate(patterns)
+        if pattern._is_literal
+    }
+    globs = tuple(
+        (index, pattern._re)
+        for index, pattern in enumerate(patterns)
+        if not pattern._is_literal
+    )
+    return literals, globs
+
+
+# Above this many alternatives a union regex gets unwieldy (the re module
+# caps named groups), so fall back to per-pattern matching.
+_UNION_LIMIT = 100
+
+
+def _build_union(globs: tuple):
+    """Join a node's glob regexes into one alternation of named groups, so
+    one match dispatch identifies which pattern claimed an item."""
+    if not globs or len(globs) > _UNION_LIMIT:
+        return None
+    return re.compile(
+        "|".join(f"(?P<p{index}>{regex.pattern})" for index, regex in globs)
+    )
+
+
+def _build_database(patterns: List["FilePattern"]):
+    """Compile a node's patterns into one Hyperscan database, so each item
+    is matched against every pattern in a single scan.
+
+    Returns None when hyperscan is not installed, the node has no
+    patterns, or a pattern uses a construct Hyperscan cannot compile; the
+    caller then falls back to the per-pattern regexes.
+    """
+    if hyperscan is None or not patterns:
+        return None
+    try:
+        database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        # Hyperscan matches are unanchored at the start, unlike re.match,
+        # so anchor each expression explicitly
+        database.compile(
+            expressions=[
+                b"^" + pattern._re.pattern.encode() for pattern in patterns
+            ],
+            ids=list(range(len(patterns))),
+        )
+        return database
+    except Exception:
+        return None
+
 
-@dataclass
+@dataclass(slots=True)
 class FilePattern:
     """Represents the structure of a file or directory.
 
@@ -24,59 +142,412 @@ class FilePattern:
     is_dir: bool = False
     sub_items: List["FilePattern"] = field(default_factory=list)
 
+    # Precomputed in __post_init__; slots keep instances compact and make
+    # the hot-loop attribute lookups a fixed-offset load.
+    _re: "re.Pattern" = field(init=False, repr=False, compare=False)
+    _has_globstar: bool = field(init=False, repr=False, compare=False)
+    _file_subs: List["FilePattern"] = field(init=False, repr=False, compare=False)
+    _dir_subs: List["FilePattern"] = field(init=False, repr=False, compare=False)
+    _globstar_subs: List["FilePattern"] = field(init=False, repr=False, compare=False)
+    _file_db: object = field(init=False, repr=False, compare=False)
+    _dir_db: object = field(init=False, repr=False, compare=False)
+    _is_literal: bool = field(init=False, repr=False, compare=False)
+    _file_exprs: tuple = field(init=False, repr=False, compare=False)
+    _file_opt: int = field(init=False, repr=False, compare=False)
+    _file_literals: dict = field(init=False, repr=False, compare=False)
+    _file_globs: tuple = field(init=False, repr=False, compare=False)
+    _file_union: object = field(init=False, repr=False, compare=False)
+    _file_globstar: int = field(init=False, repr=False, compare=False)
+    _dir_exprs: tuple = field(init=False, repr=False, compare=False)
+    _dir_opt: int = field(init=False, repr=False, compare=False)
+    _dir_literals: dict = field(init=False, repr=False, compare=False)
+    _dir_globs: tuple = field(init=False, repr=False, compare=False)
+    _dir_union: object = field(init=False, repr=False, compare=False)
 
-def get_files_and_dirs(dir: str) -> Tuple[List[str], List[str]]:
-    """Get a list of files and directories from a directory."""
-    paths = os.listdir(dir)
-    files = [path for path in paths if Path(os.path.join(dir, path)).is_file()]
-    dirs = [path for path in paths if Path(os.path.join(dir, path)).is_dir()]
+    def __post_init__(self):
+        self._re = _compile(self.expression)
+        self._has_globstar = "**" in self.expression
+        self._is_literal = _MAGIC.search(self.expression) is None
+        self._file_subs = [item for item in self.sub_items if not item.is_dir]
+        self._dir_subs = [item for item in self.sub_items if item.is_dir]
+        self._globstar_subs = [item for item in self._file_subs if item._has_globstar]
+        self._file_db = _build_database(self._file_subs)
+        self._dir_db = _build_database(self._dir_subs)
+        # Structure-of-arrays views of the sub-patterns, so the matching
+        # loops iterate flat tuples and bitmasks instead of chasing
+        # attribute lookups through pattern objects.
+        self._file_exprs = tuple(item.expression for item in self._file_subs)
+        self._file_opt = sum(
+            item.is_optional << index for index, item in enumerate(self._file_subs)
+        )
+        self._file_literals, self._file_globs = _split_literals(self._file_subs)
+        self._file_union = _build_union(self._file_globs)
+        self._file_globstar = sum(
+            item._has_globstar << index for index, item in enumerate(self._file_subs)
+        )
+        self._dir_exprs = tuple(item.expression for item in self._dir_subs)
+        self._dir_opt = sum(
+            item.is_optional << index for index, item in enumerate(self._dir_subs)
+        )
+        self._dir_literals, self._dir_globs = _split_literals(self._dir_subs)
+        self._dir_union = _build_union(self._dir_globs)
+
+
+def get_files_and_dirs(dir: str) -> Tuple[List[os.DirEntry], List[os.DirEntry]]:
+    """Get sorted lists of file and directory entries from a directory.
+
+    Returns os.DirEntry objects so callers can reuse the entry's path and
+    cached type instead of re-joining and re-stat'ing each name.
+    """
+    files = []
+    dirs = []
+    with os.scandir(dir) as entries:
+        for entry in entries:
+            # Follow symlinks, like the Path checks this replaced; the
+            # cached d_type still answers for regular entries and only
+            # actual symlinks cost a stat. Entries that are neither a file
+            # nor a directory (dangling symlinks, FIFOs) are dropped, as
+            # before.
+            if entry.is_dir():
+                dirs.append(entry)
+            elif entry.is_file():
+                files.append(entry)
+    files.sort(key=lambda entry: entry.name)
+    dirs.sort(key=lambda entry: entry.name)
     return files, dirs
 
 
 def validate_patterns(
-    items: List[str], patterns: List[FilePattern], item_type: str
+    items: List[str],
+    patterns: List[FilePattern],
+    item_type: str,
+    globstar_matched: dict = None,
+    db=None,
 ) -> bool:
-    """Validate the required patterns and match existing items."""
+    """Validate the required patterns and match existing items in one pass.
+
+    When globstar_matched is given, matches of ** patterns are recorded in
+    it and their "missing" check is deferred to the caller, which only
+    knows the answer once the whole subtree has been scanned. When a
+    Hyperscan database is given, each item is matched against all patterns
+    in a single scan instead of one regex dispatch per pattern.
+    """
+    expressions = tuple(pattern.expression for pattern in patterns)
+    opt_mask = sum(pattern.is_optional << index for index, pattern in enumerate(patterns))
+    literals, globs = _split_literals(patterns)
+    defer_mask = 0
+    if globstar_matched is not None:
+        defer_mask = sum(
+            pattern._has_globstar << index for index, pattern in enumerate(patterns)
+        )
+
+    result, matched_mask, _ = _validate_pattern_arrays(
+        items,
+        expressions,
+        opt_mask,
+        literals,
+        globs,
+        item_type,
+        defer_mask,
+        db,
+        union=_build_union(globs),
+    )
+    if globstar_matched is not None:
+        for index, pattern in enumerate(patterns):
+            if pattern._has_globstar and (matched_mask >> index) & 1:
+                globstar_matched[id(pattern)] = True
+    return result
+
+
+def _validate_pattern_arrays(
+    items: List[str],
+    expressions: tuple,
+    opt_mask: int,
+    literals: dict,
+    globs: tuple,
+    item_type: str,
+    defer_mask: int = 0,
+    db=None,
+    report_unexpected: bool = True,
+    union=None,
+) -> Tuple[bool, int, dict]:
+    """Array-based core of validate_patterns.
+
+    Takes the node's flat view of its patterns — expression tuple,
+    optional-bitmask, literal-name map, and (index, regex) pairs — and
+    returns (result, matched-bitmask, item -> first matching pattern
+    index). Patterns covered by defer_mask are exempt from the "missing"
+    check; the caller reports them once the whole subtree has been
+    scanned. With report_unexpected=False, unmatched items are tolerated
+    because the caller validates them another way.
+    """
     result = True
+    matched_mask = 0
+    unmatched = set(items)
+    item_map = {}
 
-    # Check required patterns
-    for pattern in patterns:
-        if not pattern.is_optional and not any(
-            fnmatch(item, pattern.expression) for item in items
-        ):
-            logging.error(f"missing {item_type}: {pattern.expression}")
-            result = False
+    if db is not None:
+        for item in items:
+            hits = set()
+            db.scan(
+                item.encode(),
+                match_event_handler=lambda pat_id, start, end, flags, ctx: hits.add(
+                    pat_id
+                ),
+            )
+            if hits:
+                for pat_id in hits:
+                    matched_mask |= 1 << pat_id
+                item_map[item] = min(hits)
+                unmatched.discard(item)
+    else:
+        # Literal patterns are resolved with one hash lookup per item
+        if literals:
+            for item in items:
+                index = literals.get(item)
+                if index is not None:
+                    matched_mask |= 1 << index
+                    item_map[item] = index
+                    unmatched.discard(item)
+        if union is not None:
+            # One alternation dispatch per item; the named group identifies
+            # the first glob pattern that claimed it. Items already claimed
+            # by a literal are still matched so the map keeps the lowest
+            # pattern index, like the per-pattern path.
+            for item in items:
+                match = union.match(item)
+                if match is not None:
+                    index = int(match.lastgroup[1:])
+                    matched_mask |= 1 << index
+                    previous = item_map.get(item)
+                    if previous is None or index < previous:
+                        item_map[item] = index
+                    unmatched.discard(item)
+            # The union stops at the first matching alternative, so a pattern
+            # can look unmatched even though some item satisfies it; recheck
+            # those individually before they are reported missing
+            for index, regex in globs:
+                if not (matched_mask >> index) & 1 and any(map(regex.match, items)):
+                    matched_mask |= 1 << index
+        else:
+            # Bulk-match each remaining pattern against the whole directory;
+            # filter() runs the matching loop at C level with the bound match
+            # method.
+            for index, regex in globs:
+                hits = list(filter(regex.match, items))
+                if hits:
+                    matched_mask |= 1 << index
+                    for item in hits:
+                        previous = item_map.get(item)
+                        if previous is None or index < previous:
+                            item_map[item] = index
+                    unmatched.difference_update(hits)
 
-    # Check for unexpected items
-    for item in items:
-        if not any(fnmatch(item, pattern.expression) for pattern in patterns):
-            logging.error(f"unexpected {item_type}: {item}")
-            result = False
+    # Report required patterns that never matched
+    missing = ~matched_mask & ~opt_mask & ~defer_mask & ((1 << len(expressions)) - 1)
+    if missing:
+        for index, expression in enumerate(expressions):
+            if (missing >> index) & 1:
+                logging.error(f"missing {item_type}: {expression}")
+        result = False
+
+    # Anything no pattern claimed is unexpected
+    if report_unexpected:
+        for item in items:
+            if item in unmatched:
+                logging.error(f"unexpected {item_type}: {item}")
+                result = False
+
+    return result, matched_mask, item_map
+
+
+def _extend_contexts(contexts: tuple, name: str) -> tuple:
+    """Push a directory name onto each ** context's accumulated relative
+    path. A context is a (pattern, prefix, matched) triple whose prefix
+    grows from the directory that declared the pattern."""
+    return tuple(
+        (pattern, f"{prefix}{name}/", matched)
+        for pattern, prefix, matched in contexts
+    )
 
+
+def _validate_globstar_dir(contexts: tuple, dir_entry: os.DirEntry, relpath: str) -> bool:
+    """Validate a subtree not claimed by any directory pattern against the
+    active ** contexts, matching each file's path accumulated from the
+    pattern's declaring directory."""
+    logging.info(f"validating directory: {dir_entry.path}")
+
+    result = True
+    files, dirs = get_files_and_dirs(dir_entry.path)
+    for entry in files:
+        entry_matched = False
+        for pattern, prefix, matched in contexts:
+            if pattern._re.match(prefix + entry.name):
+                matched[id(pattern)] = True
+                entry_matched = True
+        if not entry_matched:
+            logging.error(f"unexpected file: {relpath + entry.name}")
+            result = False
+    for entry in dirs:
+        result &= _validate_globstar_dir(
+            _extend_contexts(contexts, entry.name), entry, relpath + entry.name + "/"
+        )
     return result
 
 
-def validate_dir_structure(dir_pattern: FilePattern, dir: str) -> bool:
-    """Validate the directory structure."""
+def _validate_one_dir(
+    dir_pattern: FilePattern, dir: str, inherited: tuple = ()
+) -> Tuple[bool, list, list]:
+    """Validate a single directory against its pattern node.
+
+    inherited carries the (pattern, prefix, matched) contexts of **
+    patterns declared by ancestors, so files found here still satisfy
+    them at their accumulated relative path. Returns the directory's own
+    result, the (pattern, path, contexts) work items for matching
+    subdirectories, and this node's deferred (pattern, matched) ** checks,
+    which the walk evaluates once the whole tree has been scanned.
+    """
     logging.info(f"validating directory: {dir}")
 
     files, dirs = get_files_and_dirs(dir)
+    globstar_subs = dir_pattern._globstar_subs
+    globstar_matched = (
+        {id(pattern): False for pattern in globstar_subs} if globstar_subs else None
+    )
 
-    result = True
-    result &= validate_patterns(
-        files, [item for item in dir_pattern.sub_items if not item.is_dir], "file"
+    file_names = [entry.name for entry in files]
+    file_result, file_matched_mask, _ = _validate_pattern_arrays(
+        file_names,
+        dir_pattern._file_exprs,
+        dir_pattern._file_opt,
+        dir_pattern._file_literals,
+        dir_pattern._file_globs,
+        "file",
+        defer_mask=dir_pattern._file_globstar,
+        db=dir_pattern._file_db,
+        union=dir_pattern._file_union,
     )
-    result &= validate_patterns(
-        dirs, [item for item in dir_pattern.sub_items if item.is_dir], "directory"
+    result = file_result
+    if globstar_subs:
+        for index, pattern in enumerate(dir_pattern._file_subs):
+            if pattern._has_globstar and (file_matched_mask >> index) & 1:
+                globstar_matched[id(pattern)] = True
+
+    # Ancestor ** patterns see this directory's files at their accumulated
+    # relative paths
+    for pattern, prefix, matched in inherited:
+        if not matched[id(pattern)] and any(
+            pattern._re.match(prefix + name) for name in file_names
+        ):
+            matched[id(pattern)] = True
+
+    contexts = tuple(inherited) + tuple(
+        (pattern, "", globstar_matched) for pattern in globstar_subs
+    )
+
+    # Under a ** pattern intermediate directories are implicitly allowed and
+    # handed to the globstar walk instead of being reported as unexpected.
+    dir_result, _, dir_map = _validate_pattern_arrays(
+        [entry.name for entry in dirs],
+        dir_pattern._dir_exprs,
+        dir_pattern._dir_opt,
+        dir_pattern._dir_literals,
+        dir_pattern._dir_globs,
+        "directory",
+        db=dir_pattern._dir_db,
+        report_unexpected=not contexts,
+        union=dir_pattern._dir_union,
     )
+    result &= dir_result
 
-    # Recursively validate subdirectories
+    # Collect subdirectories to validate, reusing the match map instead of
+    # re-running every pattern against every name; claimed subdirs inherit
+    # the active ** contexts, unclaimed ones are walked against them
+    matching_subdirs = []
     for subdir in dirs:
-        for subdir_pattern in [item for item in dir_pattern.sub_items if item.is_dir]:
-            if fnmatch(subdir, subdir_pattern.expression):
-                result &= validate_dir_structure(
-                    subdir_pattern, os.path.join(dir, subdir)
+        index = dir_map.get(subdir.name)
+        if index is not None:
+            matching_subdirs.append(
+                (
+                    dir_pattern._dir_subs[index],
+                    subdir.path,
+                    _extend_contexts(contexts, subdir.name),
                 )
-                break
+            )
+        elif contexts:
+            result &= _validate_globstar_dir(
+                _extend_contexts(contexts, subdir.name), subdir, subdir.name + "/"
+            )
+
+    pending = [(pattern, globstar_matched) for pattern in globstar_subs]
+    return result, matching_subdirs, pending
+
+
+def validate_dir_structure(dir_pattern: FilePattern, dir: str, _memo: dict = None) -> bool:
+    """Validate the directory structure.
+
+    The tree is walked breadth-first with an explicit work queue instead
+    of recursion; each level is drained as a batch, and large batches of
+    I/O-bound directory scans run on the shared thread pool. Per-directory
+    results are memoized on (pattern, real path) so a subtree reached
+    through several patterns or cross-linking symlinks is only validated
+    once per pattern.
+    """
+    if _memo is None:
+        _memo = {}
+
+    result = True
+    pending = []
+    queue = deque([(dir_pattern, dir, ())])
+    while queue:
+        batch = []
+        claimed = set()
+        while queue:
+            node, path, contexts = queue.popleft()
+            # The key includes the inherited ** contexts (by matched-dict
+            # identity) so an aliased directory is still revisited when it
+            # has different ancestors' patterns to satisfy
+            key = (
+                id(node),
+                os.path.realpath(path),
+                tuple(id(matched) for _, _, matched in contexts),
+            )
+            if key in claimed:
+                # Same directory queued twice in this batch; it contributes
+                # its result once when the batch completes
+                continue
+            if key in _memo:
+                logging.info(f"validating directory: {path}")
+                result &= _memo[key]
+                continue
+            claimed.add(key)
+            batch.append((key, node, path, contexts))
+
+        if len(batch) > _PARALLEL_THRESHOLD:
+            outcomes = _get_executor().map(
+                _validate_one_dir,
+                [node for _, node, _, _ in batch],
+                [path for _, _, path, _ in batch],
+                [contexts for _, _, _, contexts in batch],
+            )
+        else:
+            outcomes = (
+                _validate_one_dir(node, path, contexts)
+                for _, node, path, contexts in batch
+            )
+        for (key, _, _, _), (node_result, matching_subdirs, node_pending) in zip(
+            batch, outcomes
+        ):
+            _memo[key] = node_result
+            result &= node_result
+            queue.extend(matching_subdirs)
+            pending.extend(node_pending)
+
+    # Required ** patterns are only known to be missing once the whole tree
+    # has been scanned
+    for pattern, matched in pending:
+        if not pattern.is_optional and not matched[id(pattern)]:
+            logging.error(f"missing file: {pattern.expression}")
+            result = False
 
     return result
@@ -3,6 +3,7 @@ import os
 from pathlib import Path
 import tempfile
 import logging
+import dscheck
 from dscheck import (
     FilePattern,
     get_files_and_dirs,
@@ -26,10 +27,25 @@ class TestDSCheck(unittest.TestCase):
             Path(f"{temp_dir}/test2").mkdir()
             Path(f"{temp_dir}/test3.txt").touch()
             Path(f"{temp_dir}/test4.txt").touch()
-            self.assertEqual(
-                get_files_and_dirs(temp_dir),
-                (["test3.txt", "test4.txt"], ["test", "test2"]),
-            )
+            files, dirs = get_files_and_dirs(temp_dir)
+            self.assertEqual([entry.name for entry in files], ["test3.txt", "test4.txt"])
+            self.assertEqual([entry.name for entry in dirs], ["test", "test2"])
+
+    def test_get_files_and_dirs_symlinked_dir(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            Path(f"{temp_dir}/real").mkdir()
+            os.symlink(f"{temp_dir}/real", f"{temp_dir}/link")
+            files, dirs = get_files_and_dirs(temp_dir)
+            self.assertEqual([entry.name for entry in files], [])
+            self.assertEqual([entry.name for entry in dirs], ["link", "real"])
+
+    def test_get_files_and_dirs_dangling_symlink(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            Path(f"{temp_dir}/real.txt").touch()
+            os.symlink(f"{temp_dir}/missing", f"{temp_dir}/broken")
+            files, dirs = get_files_and_dirs(temp_dir)
+            self.assertEqual([entry.name for entry in files], ["real.txt"])
+            self.assertEqual([entry.name for entry in dirs], [])
 
     def test_validate_patterns_files(self):
         files = ["test1.txt", "test2.txt", "test3.py"]
@@ -55,6 +71,26 @@ class TestDSCheck(unittest.TestCase):
         ]
         self.assertFalse(validate_patterns(files, patterns, "file"))
 
+    @unittest.skipIf(dscheck.hyperscan is None, "hyperscan is not installed")
+    def test_validate_patterns_hyperscan(self):
+        patterns = [
+            FilePattern("data?"),
+            FilePattern("README.md"),
+        ]
+        db = dscheck._build_database(patterns)
+        self.assertIsNotNone(db)
+        self.assertTrue(
+            validate_patterns(["data1", "README.md"], patterns, "file", db=db)
+        )
+        # Matches must be anchored at the start, so neither pattern claims
+        # names that merely end with a match
+        self.assertFalse(
+            validate_patterns(["mydata1", "README.md"], patterns, "file", db=db)
+        )
+        self.assertFalse(
+            validate_patterns(["data1", "not_README.md"], patterns, "file", db=db)
+        )
+
     def test_validate_dir_structure(self):
         with tempfile.TemporaryDirectory() as temp_dir:
             # Create a directory structure
@@ -123,6 +159,58 @@ class TestDSCheck(unittest.TestCase):
 
             self.assertFalse(validate_dir_structure(dir_pattern, temp_dir))
 
+    def test_validate_dir_structure_globstar(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Python files at any depth below src
+            Path(f"{temp_dir}/src").mkdir()
+            Path(f"{temp_dir}/src/main.py").touch()
+            Path(f"{temp_dir}/src/pkg").mkdir()
+            Path(f"{temp_dir}/src/pkg/util.py").touch()
+
+            dir_pattern = FilePattern(
+                "root",
+                is_dir=True,
+                sub_items=[
+                    FilePattern(
+                        "src",
+                        is_dir=True,
+                        sub_items=[
+                            FilePattern("**/*.py"),
+                        ],
+                    ),
+                ],
+            )
+
+            self.assertTrue(validate_dir_structure(dir_pattern, temp_dir))
+
+            # A non-Python file deep in the tree is unexpected
+            Path(f"{temp_dir}/src/pkg/notes.txt").touch()
+            self.assertFalse(validate_dir_structure(dir_pattern, temp_dir))
+
+    def test_validate_dir_structure_globstar_matched_subdir(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # The only Python file lives in a subdirectory claimed by an
+            # explicit directory pattern; it still satisfies the **
+            Path(f"{temp_dir}/pkg").mkdir()
+            Path(f"{temp_dir}/pkg/util.py").touch()
+
+            dir_pattern = FilePattern(
+                "root",
+                is_dir=True,
+                sub_items=[
+                    FilePattern("**/*.py"),
+                    FilePattern(
+                        "pkg",
+                        is_dir=True,
+                        sub_items=[
+                            FilePattern("util.py"),
+                        ],
+                    ),
+                ],
+            )
+
+            self.assertTrue(validate_dir_structure(dir_pattern, temp_dir))
+
 
 if __name__ == "__main__":
     unittest.main()
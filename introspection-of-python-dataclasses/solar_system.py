@@ -1,10 +1,10 @@
 from dataclasses import MISSING, Field, dataclass, field, fields, is_dataclass
-from typing import Any, Dict, List, Type, get_args, get_origin
+from functools import lru_cache
+from typing import Any, Dict, List, Type, get_args, get_origin, get_type_hints
 from types import ModuleType
-import inspect
 import solar_system
 
-@dataclass
+@dataclass(slots=True)
 class Planet:
     """
     A planet in the solar system.
@@ -28,7 +28,7 @@ class Planet:
     inclination: float = 0.0
     orbital_period: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class SolarSystem:
     """
     A solar system with planets.
@@ -50,6 +50,42 @@ class SolarSystem:
         planet.solar_system = self
         self.planets.append(planet)
 
+    @classmethod
+    def from_planet_arrays(
+        cls,
+        name: str,
+        names: List[str],
+        masses: List[float],
+        **field_arrays: List[Any],
+    ) -> "SolarSystem":
+        """
+        Bulk-constructs a solar system from parallel arrays of planet fields.
+
+        The planet list is built in a single comprehension, avoiding the
+        repeated list resizes of add_planet. For numeric-heavy analysis,
+        keep the source arrays (e.g. numpy arrays of masses or orbital
+        elements) and compute on those rather than iterating planets.
+
+        Args:
+            name (str): The name of the solar system.
+            names (List[str]): The names of the planets.
+            masses (List[float]): The masses of the planets in kilograms.
+            **field_arrays: Optional parallel arrays for any other Planet
+                field, keyed by field name (e.g. semi_major_axis=[...]).
+
+        Returns:
+            SolarSystem: The populated solar system.
+        """
+        system = cls(name)
+        keys = tuple(field_arrays)
+        system.planets = [
+            Planet(planet_name, mass, system, **dict(zip(keys, values)))
+            for planet_name, mass, *values in zip(
+                names, masses, *field_arrays.values()
+            )
+        ]
+        return system
+
 # How to list all dataclasses in a module
 def get_dataclasses(module: ModuleType) -> List[Type]:
     """
@@ -61,12 +97,22 @@ def get_dataclasses(module: ModuleType) -> List[Type]:
     Returns:
         List[Type]: A list of dataclass types found in the module.
     """
-    return [cls for name, cls in inspect.getmembers(module) if is_dataclass(cls)]
-
+    # vars() is the module's canonical namespace; unlike inspect.getmembers
+    # it avoids sorting the names and re-getattr'ing every one of them
+    return [
+        cls
+        for name, cls in vars(module).items()
+        if isinstance(cls, type) and is_dataclass(cls)
+    ]
+
+@lru_cache(maxsize=None)
 def get_type_description(field_type: Type) -> str:
     """
     Retrieves the description of a type.
 
+    The same type object is shared by many fields and the function is pure,
+    so results are memoized.
+
     Args:
         field_type (Type): The type to retrieve the description of.
 
@@ -88,6 +134,10 @@ def get_type_description(field_type: Type) -> str:
     else:
         return field_type.__name__
 
+# Field objects are shared by every fields() call for a class, so defaults
+# are cached per field identity
+_field_defaults: Dict[int, str] = {}
+
 def get_field_default(field: Field) -> str:
     """
     Retrieves the default value of a field.
@@ -98,20 +148,27 @@ def get_field_default(field: Field) -> str:
     Returns:
         Any: The default value of the field.
     """
+    cached = _field_defaults.get(id(field))
+    if cached is not None:
+        return cached
     if field.default_factory != MISSING:
-        return f"Defaults to empty {get_type_description(field.default_factory)}"
+        result = f"Defaults to empty {get_type_description(field.default_factory)}"
     elif field.default != MISSING:
-        return f"Defaults to {field.default}"
+        result = f"Defaults to {field.default}"
     else:
-        return "Required"
-    
+        result = "Required"
+    _field_defaults[id(field)] = result
+    return result
+
 if __name__ == "__main__":
 
     for dataclass in get_dataclasses(solar_system):
         print(dataclass.__name__)
-    
+
+        # Resolve forward-reference strings like "SolarSystem" once per class
+        type_hints = get_type_hints(dataclass)
         for field in fields(dataclass):
-            type_name = get_type_description(field.type)
+            type_name = get_type_description(type_hints[field.name])
             default_value = get_field_default(field)
             print(f"  {field.name} ({type_name}) : {default_value}")
         print()
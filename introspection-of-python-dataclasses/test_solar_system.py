@@ -26,6 +26,19 @@ class TestSolarSystem(unittest.TestCase):
         self.assertIn(planet, solar_system.planets)
         self.assertEqual(planet.solar_system, solar_system)
 
+    def test_from_planet_arrays(self):
+        solar_system = SolarSystem.from_planet_arrays(
+            "Solar System",
+            ["Mercury", "Venus"],
+            [3.301e23, 4.867e24],
+            orbital_period=[0.24, 0.62],
+        )
+        self.assertEqual(len(solar_system.planets), 2)
+        self.assertEqual(solar_system.planets[0].name, "Mercury")
+        self.assertEqual(solar_system.planets[1].mass, 4.867e24)
+        self.assertEqual(solar_system.planets[1].orbital_period, 0.62)
+        self.assertEqual(solar_system.planets[0].solar_system, solar_system)
+
     def test_get_dataclasses(self):
         dataclasses = get_dataclasses(solar_system)
         self.assertIn(Planet, dataclasses)